@@ -5,14 +5,14 @@ from pydantic import (
     Field,
     field_validator,
     model_validator,
-    computed_field,
 )
-from typing import Any, Literal
+from typing import Annotated, Any, Literal
 from logging import getLogger
+from functools import cached_property
+from benchalot.interpolate import get_variable_names
 from benchalot.output_constants import (
     DEFAULT_STAGE_NAME,
-    METRIC_COLUMN,
-    STAGE_COLUMN,
+    DEFAULT_PIVOT,
     CONSTANT_COLUMNS,
 )
 from enum import StrEnum
@@ -21,12 +21,10 @@ logger = getLogger(f"benchalot.{__name__}")
 
 
 def error_and_exit(error):
-    error_msgs = []
-    for e in error.errors():
-        locations = e["loc"]
-        location_str = ".".join(locations)
-        error_msgs.append(f"{location_str}: {e['msg']}, received '{e['input']}'.")
-    error_str = "\n".join(error_msgs)
+    error_str = "\n".join(
+        f"{'.'.join(map(str, e['loc']))}: {e['msg']}, received '{e['input']}'."
+        for e in error.errors()
+    )
     logger.critical(f"Config validation failed:\n{error_str}")
     exit(1)
 
@@ -47,10 +45,9 @@ class SystemSection(BaseModel):
     disable_smt: bool = Field(default=False, alias="disable-smt")
     disable_core_boost: bool = Field(default=False, alias="disable-core-boost")
     governor_performance: bool = Field(default=False, alias="governor-performance")
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
-    @computed_field  # type: ignore
-    @property
+    @cached_property
     def modify(self) -> bool:
         """ "Whether the system will need to be modified."""
         isolate_cpus_empty = not self.isolate_cpus
@@ -93,6 +90,12 @@ class OutputField(BaseModel):
 
     filename: str
     format: str
+    model_config = ConfigDict(frozen=True)
+
+    @cached_property
+    def filename_variables(self) -> list[str]:
+        """Names of variables referenced in the filename."""
+        return get_variable_names(self.filename)
 
 
 class CsvOutput(OutputField):
@@ -174,7 +177,7 @@ class TableOutput(OutputField):
         "median",
         "max",
     ]
-    pivot: str | None = "{{" + STAGE_COLUMN + "}} {{" + METRIC_COLUMN + "}}"
+    pivot: str | None = DEFAULT_PIVOT
     metrics: list[str] | None = None
     model_config = ConfigDict(extra="forbid")
 
@@ -189,13 +192,16 @@ class TableHTMLOutput(TableOutput):
 
 ResultsSection = dict[
     str,
-    TableHTMLOutput
-    | CsvOutput
-    | BarChartOutput
-    | BoxPlotOutput
-    | ScatterPlotOutput
-    | ViolinPlotOutput
-    | TableMdOutput,
+    Annotated[
+        TableHTMLOutput
+        | CsvOutput
+        | BarChartOutput
+        | BoxPlotOutput
+        | ScatterPlotOutput
+        | ViolinPlotOutput
+        | TableMdOutput,
+        Field(discriminator="format"),
+    ],
 ]
 
 
@@ -211,30 +217,31 @@ class ConfigFile(BaseModel):
         output: Section containing desired outputs.
     """
 
-    matrix: dict[str, list] = {}
-    exclude: list[dict[str, str | int | float | dict]] = []
-    include: list[dict[str, str | int | float | dict]] = []
+    matrix: dict[str, list] = Field(default_factory=dict)
+    exclude: list[dict[str, str | int | float | dict]] = Field(default_factory=list)
+    include: list[dict[str, str | int | float | dict]] = Field(default_factory=list)
     system: SystemSection = SystemSection()
     results: ResultsSection | None = None
     samples: int = 1
     save_output: str | None = Field(default=None, alias="save-output")
-    setup: list[str] | str = []
-    prepare: list[str] | str = []
+    setup: list[str] | str = Field(default_factory=list)
+    prepare: list[str] | str = Field(default_factory=list)
     benchmark: dict[str, list | str]
-    conclude: list[str] | str = []
-    cleanup: list[str] | str = []
+    conclude: list[str] | str = Field(default_factory=list)
+    cleanup: list[str] | str = Field(default_factory=list)
     cwd: str | None = None
-    metrics: set[BuiltInMetrics] = set()
-    custom_metrics: list[dict[str, str]] = Field(default=[], alias="custom-metrics")
-    env: dict[str, str] = {}
+    metrics: set[BuiltInMetrics] = Field(default_factory=set)
+    custom_metrics: list[dict[str, str]] = Field(
+        default_factory=list, alias="custom-metrics"
+    )
+    env: dict[str, str] = Field(default_factory=dict)
     model_config = ConfigDict(extra="forbid")
 
     @model_validator(mode="before")
     def name_stages(self):
         """Transform list of commands to dictionary of lists of commands."""
-        if isinstance(self["benchmark"], list) or isinstance(self["benchmark"], str):
-            self["benchmark"] = {DEFAULT_STAGE_NAME: self["benchmark"]}
-            return self
+        if isinstance(self, dict) and isinstance(self.get("benchmark"), (list, str)):
+            return {**self, "benchmark": {DEFAULT_STAGE_NAME: self["benchmark"]}}
         return self
 
     @field_validator("env", mode="before")
@@ -263,9 +270,8 @@ class ConfigFile(BaseModel):
     @model_validator(mode="after")
     def variable_not_a_metric(self):
         """Check if one of matrix variable names is the same as one of the metrics."""
-        metric_names = [str(metric) for metric in self.metrics] + [
-            list(metric.items())[0][0] for metric in self.custom_metrics
-        ]
+        metric_names = {str(metric) for metric in self.metrics}
+        metric_names.update(next(iter(metric)) for metric in self.custom_metrics)
         for var_name in self.matrix:
             if var_name in metric_names:
                 raise ValueError(
@@ -278,10 +284,8 @@ class ConfigFile(BaseModel):
         """Check if results section contains at least one csv output, if not create a default `result.csv` output config."""
         if not self.results:
             self.results = {}
-        for output_key in self.results:
-            output = self.results[output_key]
-            if output.format == OutputFormat.CSV:
-                return self
+        if any(output.format == OutputFormat.CSV for output in self.results.values()):
+            return self
         self.results["default-csv"] = CsvOutput(
             format=OutputFormat.CSV, filename="result.csv"
         )
@@ -301,7 +305,7 @@ class OutputConfig(BaseModel):
 def validate_config(config) -> ConfigFile:
     logger.info("Validating config...")
     try:
-        config_validator = ConfigFile(**config)
+        config_validator = ConfigFile.model_validate(config)
     except ValidationError as e:
         error_and_exit(e)
     normalized_config = config_validator
@@ -312,7 +316,7 @@ def validate_config(config) -> ConfigFile:
 def validate_output_config(config) -> OutputConfig:
     logger.info("Validating output config...")
     try:
-        config_validator = OutputConfig(**config)
+        config_validator = OutputConfig.model_validate(config)
     except ValidationError as e:
         error_and_exit(e)
     normalized_config = config_validator
@@ -1,7 +1,6 @@
 from subprocess import Popen, PIPE
 from logging import getLogger
 from os import (
-    getcwd,
     wait4,
     waitstatus_to_exitcode,
     environ,
@@ -33,7 +32,8 @@ from collections import deque
 from os.path import expandvars, expanduser
 
 logger = getLogger(f"benchalot.{__name__}")
-working_directory = getcwd()
+# `None` runs commands in the current working directory of benchalot
+working_directory: str | None = None
 
 
 def set_working_directory(cwd: str) -> None:
@@ -208,6 +208,12 @@ def perform_benchmarks(
         dict[str, list]: Dictionary containing results.
     """
     results: dict[str, list] = dict()
+    measure_time = BuiltInMetrics.TIME in builtin_metrics
+    measure_utime = BuiltInMetrics.UTIME in builtin_metrics
+    measure_stime = BuiltInMetrics.STIME in builtin_metrics
+    measure_memory = BuiltInMetrics.MEM in builtin_metrics
+    measure_stdout = BuiltInMetrics.STDOUT in builtin_metrics
+    measure_stderr = BuiltInMetrics.STDERR in builtin_metrics
     with console.bar((len(benchmarks) * samples)) as bar:
 
         def _execute_section(commands):
@@ -244,13 +250,6 @@ def perform_benchmarks(
                         if not has_failed and not _execute_section(benchmark.prepare):
                             has_failed = True
 
-                        measure_time = BuiltInMetrics.TIME in builtin_metrics
-                        measure_utime = BuiltInMetrics.UTIME in builtin_metrics
-                        measure_stime = BuiltInMetrics.STIME in builtin_metrics
-                        measure_memory = BuiltInMetrics.MEM in builtin_metrics
-                        measure_stdout = BuiltInMetrics.STDOUT in builtin_metrics
-                        measure_stderr = BuiltInMetrics.STDERR in builtin_metrics
-
                         time_measurements: dict[str, float | None] = {}
                         utime_measurements: dict[str, float | None] = {}
                         stime_measurements: dict[str, float | None] = {}
@@ -358,8 +357,7 @@ def perform_benchmarks(
 
                         benchmark_results: dict[str, dict[str, float | int | None]] = {}
 
-                        for custom_metric in benchmark.custom_metrics:
-                            metric_name, command = list(custom_metric.items())[0]
+                        for metric_name, command in benchmark.custom_metrics:
                             custom_measurements, custom_metric_failed = (
                                 gather_custom_metric(command)
                             )
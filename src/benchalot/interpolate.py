@@ -1,9 +1,14 @@
 from itertools import product
-from re import sub
+from re import compile as re_compile
 from logging import getLogger
+from functools import lru_cache
 
 logger = getLogger(f"benchalot.{__name__}")
 VAR_REGEX = r"{{([a-zA-Z0-9_\-.]+)}}"
+VAR_PATTERN = re_compile(VAR_REGEX)
+TEMPLATE_CACHE_SIZE = 1024
+
+Template = tuple[str, ...]
 
 
 def create_variable_combinations(**kwargs):
@@ -12,33 +17,117 @@ def create_variable_combinations(**kwargs):
     Args:
         kwargs: Dictionary containing list of variable values.
     """
-    keys = kwargs.keys()
+    keys = tuple(kwargs)
     for instance in product(*kwargs.values()):
         yield dict(zip(keys, instance))
 
 
-def interpolate_variables(string: str, variables: dict[str, str | int]) -> str:
+def get_variable_names(string: str) -> list[str]:
+    """Get names of variables referenced in a string.
+
+    Args:
+        string: String containing variable references.
+
+    Returns:
+        list[str]: Names of referenced variables in order of first appearance, without duplicates.
+    """
+    return list(dict.fromkeys(match.group(1) for match in VAR_PATTERN.finditer(string)))
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(string: str) -> Template:
+    """Split string into literal text and variable references, so that it can be interpolated repeatedly without searching it again.
+    Results are cached, so compiling the same string again is a dictionary lookup.
+
+    Args:
+        string: String to be compiled.
+
+    Returns:
+        Template: Literal text at even indices and names of referenced variables at odd indices.
+    """
+    return tuple(VAR_PATTERN.split(string))
+
+
+def render_template(
+    template: Template,
+    variables: dict[str, str | int],
+    resolved: dict[str, str] | None = None,
+) -> str:
+    """Replace variable references with values in a compiled string.
+
+    Args:
+        template: String compiled by `compile_template`.
+        variables: Variable names paired with values.
+        resolved: Variable references already converted to strings, see `interpolate_variables`.
+
+    Returns:
+        str: String with all variable references replaced.
+    """
+    if len(template) == 1:
+        return template[0]
+    if resolved is None:
+        resolved = {}
+    try:
+        if len(template) == 3:
+            # single reference, the most common case
+            variable_name = template[1]
+            if variable_name not in resolved:
+                resolved[variable_name] = str(
+                    get_variable_value(variable_name, variables)
+                )
+            return template[0] + resolved[variable_name] + template[2]
+        parts = list(template)
+        for i in range(1, len(parts), 2):
+            variable_name = parts[i]
+            if variable_name not in resolved:
+                resolved[variable_name] = str(
+                    get_variable_value(variable_name, variables)
+                )
+            parts[i] = resolved[variable_name]
+        return "".join(parts)
+    except (KeyError, TypeError):
+        string = "".join(
+            part if i % 2 == 0 else "{{" + part + "}}"
+            for i, part in enumerate(template)
+        )
+        logger.critical(f"'{string}': Variable '{variable_name}' not found")
+        exit(1)
+
+
+def get_variable_value(variable_name: str, variables: dict[str, str | int]):
+    """Get value of a (possibly compound) variable.
+    Raises `KeyError` or `TypeError` if the variable or one of its fields does not exist.
+
+    Args:
+        variable_name: Name of the variable, fields of compound variables separated by dots.
+        variables: Variable names paired with values.
+
+    Returns:
+        Value of the variable.
+    """
+    if variable_name in variables:
+        return variables[variable_name]
+    value = variables
+    for field in variable_name.split("."):
+        value = value[field]  # type: ignore
+    return value
+
+
+def interpolate_variables(
+    string: str,
+    variables: dict[str, str | int],
+    resolved: dict[str, str] | None = None,
+) -> str:
     """Replace variable references with values.
 
     Args:
         string: String to be modified.
         variables: Variable names paired with values.
+        resolved: Variable references already converted to strings. Shared between calls using the same `variables` to convert each value only once.
 
     Returns:
         str: String with all variable references replaced.
     """
-
-    def replace_substring(match):
-        variable_name = match.group(1)
-        compound = variable_name.split(".")
-        value = variables
-        for field in compound:
-            try:
-                value = value[field]
-            except (KeyError, TypeError):
-                logger.critical(f"'{string}': Variable '{variable_name}' not found")
-                exit(1)
-        return str(value)
-
-    new_string = sub(VAR_REGEX, replace_substring, string)
-    return new_string
+    if "{{" not in string:
+        return string
+    return render_template(compile_template(string), variables, resolved)
@@ -75,8 +75,8 @@ def main():
                     print(command)
             for command in benchmark.conclude:
                 print(command)
-            for custom_metric in benchmark.custom_metrics:
-                print(list(custom_metric.items())[0][1])
+            for _, command in benchmark.custom_metrics:
+                print(command)
             if config.samples > 1:
                 print(("─" * (2 * pad + len(msg_mul))))
             for command in benchmark.cleanup:
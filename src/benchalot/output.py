@@ -14,7 +14,7 @@ from benchalot.config import (
     ResultsSection,
 )
 from benchalot.interpolate import (
-    VAR_REGEX,
+    get_variable_names,
     interpolate_variables,
 )
 from benchalot.output_constants import (
@@ -25,11 +25,11 @@ from benchalot.output_constants import (
     BENCHMARK_ID_COLUMN,
     METRIC_COLUMN,
     CONSTANT_COLUMNS,
+    DEFAULT_PIVOT,
 )
-from re import findall, sub
+from re import sub
 from collections.abc import Generator, Iterable
 from typing import Literal
-from copy import deepcopy
 from plotnine import (
     ggplot,
     aes,
@@ -127,10 +127,12 @@ def columns_exist(columns, df):
 
 
 def metrics_exist(metrics, df):
-    metrics_in_table = df[METRIC_COLUMN].unique()
+    metrics_in_table = dict.fromkeys(df[METRIC_COLUMN].unique())
     for m in metrics:
         if m not in metrics_in_table:
-            logger.error(f"'{m}' is not a metric (metrics: [{', '.join(metrics)}]).")
+            logger.error(
+                f"'{m}' is not a metric (metrics: [{', '.join(map(str, metrics_in_table))}])."
+            )
             return False
     return True
 
@@ -173,19 +175,15 @@ def get_stat_table(
         show_columns = show_columns.copy()
         if not columns_exist(show_columns, results_df):
             return None
-    if pivot:
-        if not columns_exist(findall(VAR_REGEX, pivot), results_df):
-            return None
+    pivot_columns = get_variable_names(pivot) if pivot else []
+    if not columns_exist(pivot_columns, results_df):
+        return None
     if metrics:
         if not metrics_exist(metrics, results_df):
             return None
 
     if metrics:
         results_df = filter_by_metrics(results_df, metrics)
-    if pivot:
-        pivot_columns = findall(VAR_REGEX, pivot)
-    else:
-        pivot_columns = []
     show_columns = [col for col in show_columns if col not in pivot_columns]
 
     result_columns = []
@@ -330,8 +328,7 @@ def output_plot(
         plot_config: Configuration regarding the plot.
     """
 
-    def validate_columns(config: BasePlotOutput, df):
-        plot_config = deepcopy(config)
+    def validate_columns(plot_config: BasePlotOutput, df):
         columns = []
         if plot_config.x_axis:
             columns.append(plot_config.x_axis)
@@ -346,7 +343,9 @@ def output_plot(
                 logger.error("no metric specified.")
                 return None
             else:
-                plot_config.y_axis = df[METRIC_COLUMN].iloc[0]
+                return plot_config.model_copy(
+                    update={"y_axis": df[METRIC_COLUMN].iloc[0]}
+                )
         elif not metrics_exist([plot_config.y_axis], df):
             return None
         return plot_config
@@ -471,7 +470,7 @@ def get_combination_filtered_dfs(
 
 def create_output(output: OutputField, results_df: pd.DataFrame):
     logger.debug(f"Creating output for {output}")
-    variables_in_filename = findall(VAR_REGEX, output.filename)
+    variables_in_filename = output.filename_variables
     multiplied_results: Iterable[tuple[dict, pd.DataFrame]]
     if not variables_in_filename:
         multiplied_results = [({}, results_df)]
@@ -620,8 +619,7 @@ def _output_results(
         os.umask(prev_umask)
     console.print()
     console.print(("─" * 7) + "SUMMARY" + ("─" * 7))
-    for metric in results_df[METRIC_COLUMN].unique():
-        table_df = results_df.loc[results_df[METRIC_COLUMN] == metric]
+    for _, table_df in results_df.groupby(METRIC_COLUMN, observed=True, sort=False):
         excluded_columns = [
             HAS_FAILED_COLUMN,
             BENCHMARK_ID_COLUMN,
@@ -636,7 +634,7 @@ def _output_results(
             table_df,
             ["min", "median", "max"],
             [col for col in table_df.columns if col not in excluded_columns],
-            "{{" + STAGE_COLUMN + "}} {{" + METRIC_COLUMN + "}}",
+            DEFAULT_PIVOT,
         )
         if print_table is not None:
             console.print(
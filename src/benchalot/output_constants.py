@@ -7,12 +7,15 @@ HAS_FAILED_COLUMN = "failed"
 METRIC_COLUMN = "metric"
 STAGE_COLUMN = "stage"
 RESULT_COLUMN = "result"
-CONSTANT_COLUMNS = [
-    BENCHMARK_ID_COLUMN,
-    TIME_STAMP_COLUMN,
-    HAS_FAILED_COLUMN,
-    METRIC_COLUMN,
-    STAGE_COLUMN,
-    RESULT_COLUMN,
-]
+CONSTANT_COLUMNS = frozenset(
+    [
+        BENCHMARK_ID_COLUMN,
+        TIME_STAMP_COLUMN,
+        HAS_FAILED_COLUMN,
+        METRIC_COLUMN,
+        STAGE_COLUMN,
+        RESULT_COLUMN,
+    ]
+)
 DEFAULT_STAGE_NAME = ""
+DEFAULT_PIVOT = "{{" + STAGE_COLUMN + "}} {{" + METRIC_COLUMN + "}}"
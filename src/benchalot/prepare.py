@@ -1,17 +1,22 @@
 from logging import getLogger
 from benchalot.interpolate import (
     create_variable_combinations,
-    interpolate_variables,
+    compile_template,
+    render_template,
+    Template,
 )
 from dataclasses import dataclass
+from collections.abc import Iterable, Iterator
+from itertools import chain
 from benchalot.config import ConfigFile
 from benchalot.output_constants import TIME_STAMP_COLUMN, TIME_STAMP
 from os.path import expandvars, expanduser
 
 logger = getLogger(f"benchalot.{__name__}")
+CSET_SHIELD_PREFIX = "cset shield --exec -- "
 
 
-@dataclass
+@dataclass(slots=True)
 class PreparedBenchmark:
     """Structure representing a single benchmark.
 
@@ -21,7 +26,7 @@ class PreparedBenchmark:
         prepare: Commands to be executed before the measurement.
         benchmark: Commands to be measured.
         conclude: Commands to be executed after the measurement.
-        custom_metrics: List of custom_metrics (names and commands) to be gathered during execution.
+        custom_metrics: Names of custom metrics paired with commands gathering them during execution.
         cleanup: Commands to be executed after the measurement, not multiplied by number of samples.
         env: Evironment variable values set for the benchmark.
         cwd: Working directory of the benchmark commands.
@@ -33,68 +38,205 @@ class PreparedBenchmark:
     prepare: list[str]
     benchmark: dict[str, list[str]]
     conclude: list[str]
-    custom_metrics: list[dict[str, str]]
+    custom_metrics: list[tuple[str, str]]
     cleanup: list[str]
     env: dict[str, str]
     cwd: str | None
     save_output: str | None
 
 
-def interpolate_commands(commands: list, variables: dict[str, str | int]) -> list[str]:
-    """Replace variable references with values in multiple commands.
+@dataclass(slots=True)
+class CompiledCommands:
+    """Commands compiled once and rendered for every variable combination.
+
+    Attributes:
+        templates: Compiled commands, see `compile_template`.
+        static: The commands themselves if none of them reference a variable, otherwise `None`.
+    """
+
+    templates: list[Template]
+    static: list[str] | None
+
+
+def compile_commands(commands: list[str]) -> CompiledCommands:
+    """Compile multiple commands, see `compile_template`.
+
+    Args:
+        commands: List of commands.
+    Returns:
+        CompiledCommands: Compiled commands.
+    """
+    templates = [compile_template(command) for command in commands]
+    if all(len(template) == 1 for template in templates):
+        return CompiledCommands(templates, commands)
+    return CompiledCommands(templates, None)
+
+
+def interpolate_commands(
+    commands: CompiledCommands,
+    variables: dict[str, str | int],
+    resolved: dict[str, str] | None = None,
+) -> list[str]:
+    """Replace variable references with values in multiple compiled commands.
 
     Args:
-        command: List of commands.
+        commands: Commands compiled by `compile_commands`.
         variables: Variable names paired with values.
+        resolved: Variable references already converted to strings, see `interpolate_variables`.
     Returns:
-        list[str]: List of commands with all variable references replaced.
+        list[str]: List of commands with all variable references replaced. If none of the commands reference a variable, the original list, shared by all benchmarks.
     """
-    prepared_commands = []
-    for command in commands:
-        prepared_commands.append(interpolate_variables(command, variables))
-    return prepared_commands
+    if commands.static is not None:
+        return commands.static
+    if resolved is None:
+        resolved = {}
+    return [
+        render_template(command, variables, resolved) for command in commands.templates
+    ]
 
 
-def exclude_combination(
-    var_value_assignments: dict[str, int | str],
+ExclusionIndex = dict[tuple[str, ...], set[tuple]]
+
+
+def hashable_value(value):
+    """Convert variable value to a hashable object which compares the same way as the value.
+
+    Args:
+        value: Variable value, possibly a (nested) dictionary or list.
+
+    Returns:
+        Hashable representation of the value.
+    """
+    if isinstance(value, dict):
+        return frozenset((k, hashable_value(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(hashable_value(v) for v in value)
+    return value
+
+
+def index_exclusions(
     exclude: list[dict[str, str | int | float | dict]],
+) -> ExclusionIndex:
+    """Group exclusions by the variables they assign, so that they can be checked with set lookups.
+
+    Args:
+        exclude: List of exclusions.
+
+    Returns:
+        ExclusionIndex: Excluded value tuples keyed by sorted variable names.
+    """
+    index: ExclusionIndex = {}
+    for exclusion in exclude:
+        keys = tuple(sorted(exclusion))
+        values = tuple(hashable_value(exclusion[key]) for key in keys)
+        index.setdefault(keys, set()).add(values)
+    return index
+
+
+def exclude_combination(
+    var_value_assignments: dict,
+    exclusions: ExclusionIndex,
 ) -> bool:
     """Check if given set of value assignments should be excluded based on exclude list.
 
     Args:
         var_value_assignments:  Assignment of variable values.
-        exclude: List of exclude.
+        exclusions: Index of exclusions created by `index_exclusions`.
 
     Returns:
         bool: `True` if assignment should be excluded, otherwiese `False`.
     """
-    for exclusion in exclude:
-        if exclusion.items() <= var_value_assignments.items():
+    for keys, excluded_values in exclusions.items():
+        try:
+            values = tuple(hashable_value(var_value_assignments[key]) for key in keys)
+        except KeyError:
+            continue
+        if values in excluded_values:
             return True
     return False
 
 
-def process_custom_metrics(
+def create_pruned_combinations(
+    matrix: dict[str, list], exclusions: ExclusionIndex
+) -> Iterator[dict]:
+    """Create all possible variable values combinations which are not excluded.
+    Each exclusion is checked as soon as all of its variables are assigned, skipping whole branches of the Cartesian product.
+
+    Args:
+        matrix: Dictionary containing list of variable values.
+        exclusions: Index of exclusions created by `index_exclusions`.
+
+    Yields:
+        dict: Combination of variable values.
+    """
+    names = list(matrix)
+    # checks[level] holds exclusions which can be tested once `level` variables are assigned
+    checks: list[list[tuple[tuple[str, ...], set[tuple]]]] = [[] for _ in names]
+    checks.append([])
+    for keys, excluded_values in exclusions.items():
+        if all(key in matrix for key in keys):
+            level = max((names.index(key) + 1 for key in keys), default=0)
+            checks[level].append((keys, excluded_values))
+    if not any(checks):
+        yield from create_variable_combinations(**matrix)
+        return
+
+    partial: dict = {}
+
+    def assign(level: int) -> Iterator[dict]:
+        for keys, excluded_values in checks[level]:
+            if tuple(hashable_value(partial[key]) for key in keys) in excluded_values:
+                return
+        if level == len(names):
+            yield dict(partial)
+            return
+        name = names[level]
+        for value in matrix[name]:
+            partial[name] = value
+            yield from assign(level + 1)
+
+    yield from assign(0)
+
+
+def compile_custom_metrics(
     metrics: list[dict[str, str]],
-    variables: dict[str, str | int] | None = None,
-) -> list[dict[str, str]]:
-    """Divide metrics into custom and built-in metrics.
+) -> list[tuple[str, Template]]:
+    """Compile custom metric commands, see `compile_template`.
 
     Args:
-        metrics: List of metrics.
-        variables: Variable names paired with their values. Used with custom metrics.
+        metrics: List of custom metrics.
 
     Returns:
-        List of custom metrics.
+        list[tuple[str, Template]]: Names of custom metrics paired with their compiled commands.
     """
-    custom_metrics = []
+    compiled_metrics = []
     for metric in metrics:
-        metric_command = list(metric.items())[0][1]  # type: ignore
-        metric_name = list(metric.items())[0][0]  # type: ignore
-        if variables:
-            metric_command = interpolate_variables(metric_command, variables)
-        custom_metrics.append({metric_name: metric_command})
-    return custom_metrics
+        metric_name, metric_command = next(iter(metric.items()))
+        compiled_metrics.append((metric_name, compile_template(metric_command)))
+    return compiled_metrics
+
+
+def process_custom_metrics(
+    metrics: list[tuple[str, Template]],
+    variables: dict[str, str | int],
+    resolved: dict[str, str] | None = None,
+) -> list[tuple[str, str]]:
+    """Replace variable references with values in custom metric commands.
+
+    Args:
+        metrics: Custom metrics compiled by `compile_custom_metrics`.
+        variables: Variable names paired with their values.
+        resolved: Variable references already converted to strings, see `interpolate_variables`.
+
+    Returns:
+        list[tuple[str, str]]: Names of custom metrics paired with their commands.
+    """
+    if resolved is None:
+        resolved = {}
+    return [
+        (metric_name, render_template(metric_command, variables, resolved))
+        for metric_name, metric_command in metrics
+    ]
 
 
 def convert_to_list(commands) -> list[str]:
@@ -112,59 +254,89 @@ def prepare_benchmarks(config: ConfigFile) -> list[PreparedBenchmark]:
     Returns:
         list[PreparedBenchmark]: List of unique benchmarks containing their variable combination, modified commands and metrics.
     """
-    base_setup = convert_to_list(config.setup)
-    base_prepare = convert_to_list(config.prepare)
+    benchmarks = list(iter_prepared_benchmarks(config))
+    logger.debug(f"Prepared benchmarks: {benchmarks}")
+    return benchmarks
+
+
+def iter_prepared_benchmarks(config: ConfigFile) -> Iterator[PreparedBenchmark]:
+    """Prepare benchmark commands one variable combination at a time.
+
+    Args:
+        config: Object representing configuration file.
+    Yields:
+        PreparedBenchmark: Benchmark containing its variable combination, modified commands and metrics.
+    """
+    base_setup = compile_commands(convert_to_list(config.setup))
+    base_prepare = compile_commands(convert_to_list(config.prepare))
     base_benchmark = {}
     for stage in config.benchmark:
-        base_benchmark[stage] = convert_to_list(config.benchmark[stage])
-    base_conclude = convert_to_list(config.conclude)
-    base_cleanup = convert_to_list(config.cleanup)
-    if config.system.isolate_cpus:
-        for name in base_benchmark:
-            commands = base_benchmark[name]
-            for i, c in enumerate(commands):
-                base_benchmark[name][i] = "cset shield --exec -- " + c
-    benchmarks: list[PreparedBenchmark] = []
+        base_benchmark[stage] = compile_commands(
+            convert_to_list(config.benchmark[stage])
+        )
+    base_conclude = compile_commands(convert_to_list(config.conclude))
+    base_cleanup = compile_commands(convert_to_list(config.cleanup))
+    base_custom_metrics = compile_custom_metrics(config.custom_metrics)
+    # values without variable references are expanded only once
+    base_env: dict[str, str | Template] = {}
+    for var, value in config.env.items():
+        if "{{" in value:
+            base_env[var] = compile_template(value)
+        else:
+            base_env[var] = expanduser(expandvars(value))
+    base_cwd = compile_template(config.cwd) if config.cwd else None
+    base_save_output = (
+        compile_template(config.save_output) if config.save_output else None
+    )
     logger.info("Preparing benchmarks...")
+    exclusions = index_exclusions(config.exclude)
     logger.debug("Creating variable combinations...")
-    var_combinations = list(create_variable_combinations(**config.matrix))
-    var_combinations += config.include
+    include = [
+        combination
+        for combination in config.include
+        if combination and not exclude_combination(combination, exclusions)
+    ]
+    var_combinations: Iterable[dict] = include
+    if config.matrix or not config.include:
+        var_combinations = chain(
+            create_pruned_combinations(config.matrix, exclusions), include
+        )
     for var_combination in var_combinations:
-        if not var_combination and len(var_combinations) > 1:
-            continue
-        if exclude_combination(var_combination, config.exclude):
-            continue
-
         tmp = {TIME_STAMP_COLUMN: TIME_STAMP}
         tmp.update(var_combination)
         var_combination = tmp
 
-        setup = interpolate_commands(base_setup, var_combination)
-        prepare = interpolate_commands(base_prepare, var_combination)
+        resolved: dict[str, str] = {}
+        setup = interpolate_commands(base_setup, var_combination, resolved)
+        prepare = interpolate_commands(base_prepare, var_combination, resolved)
         benchmark = {}
         for name in base_benchmark:
             benchmark[name] = interpolate_commands(
-                base_benchmark[name], var_combination
+                base_benchmark[name], var_combination, resolved
             )
-        conclude = interpolate_commands(base_conclude, var_combination)
-        custom_metrics = process_custom_metrics(config.custom_metrics, var_combination)
-        cleanup = interpolate_commands(base_cleanup, var_combination)
-
-        env = config.env.copy()
-        for var in env:
-            env[var] = interpolate_variables(env[var], var_combination)
-            env[var] = expandvars(env[var])
-            env[var] = expanduser(env[var])
-        cwd: str | None
-        if config.cwd:
-            cwd = interpolate_variables(config.cwd, var_combination)
-        else:
-            cwd = config.cwd
-        save_output: str | None
-        if config.save_output:
-            save_output = interpolate_variables(config.save_output, var_combination)
-        else:
-            save_output = config.save_output
+            if config.system.isolate_cpus:
+                benchmark[name] = [
+                    CSET_SHIELD_PREFIX + command for command in benchmark[name]
+                ]
+        conclude = interpolate_commands(base_conclude, var_combination, resolved)
+        custom_metrics = process_custom_metrics(
+            base_custom_metrics, var_combination, resolved
+        )
+        cleanup = interpolate_commands(base_cleanup, var_combination, resolved)
+
+        env = {}
+        for var, env_value in base_env.items():
+            if isinstance(env_value, str):
+                env[var] = env_value
+            else:
+                rendered = render_template(env_value, var_combination, resolved)
+                env[var] = expanduser(expandvars(rendered))
+        cwd: str | None = config.cwd
+        if base_cwd:
+            cwd = render_template(base_cwd, var_combination, resolved)
+        save_output: str | None = config.save_output
+        if base_save_output:
+            save_output = render_template(base_save_output, var_combination, resolved)
 
         prepared_benchmark = PreparedBenchmark(
             matrix=var_combination,
@@ -178,6 +350,4 @@ def prepare_benchmarks(config: ConfigFile) -> list[PreparedBenchmark]:
             cwd=cwd,
             save_output=save_output,
         )
-        benchmarks.append(prepared_benchmark)
-    logger.debug(f"Prepared benchmarks: {benchmarks}")
-    return benchmarks
+        yield prepared_benchmark
@@ -61,6 +61,7 @@ def modify_system_state(system_options: SystemSection) -> None:
     """
     logger.info("Modifying system state...")
     register(restore_system_state)
+    cpu_total = cpu_count()
     if system_options.disable_aslr:
         logger.debug("Disabling ASLR...")
         system_state["aslr"] = get_and_set(
@@ -68,10 +69,7 @@ def modify_system_state(system_options: SystemSection) -> None:
         )
         logger.debug("Disabled ASLR.")
     if system_options.isolate_cpus:
-        cpu_str = ""
-        for cpu in system_options.isolate_cpus:
-            cpu_str += str(cpu) + ","
-        cpu_str = cpu_str[:-1]
+        cpu_str = ",".join(map(str, system_options.isolate_cpus))
         logger.debug(f"Shielding CPUs {cpu_str}...")
         result = run(
             f"cset shield --cpu={cpu_str} --kthread=on", shell=True, capture_output=True
@@ -88,21 +86,22 @@ def modify_system_state(system_options: SystemSection) -> None:
         cpus = (
             system_options.isolate_cpus
             if system_options.isolate_cpus
-            else range(cpu_count())
+            else range(cpu_total)
         )
         logger.debug(f"Setting CPU governor for CPUs {cpus}...")
+        previous_governors = {}
         for cpu in cpus:
-            system_state[f"governor{cpu}"] = get_and_set(
-                f"/sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_governor",
-                "performance",
+            governor_file = f"/sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_governor"
+            previous_governors[governor_file] = get_and_set(
+                governor_file, "performance"
             )
-        system_state["governor-performance"] = "yes"
+        system_state["governor-performance"] = previous_governors
         logger.debug(f"Set CPU governor for CPUs {cpus}.")
     if system_options.disable_smt:
         cpus = (
             system_options.isolate_cpus
             if system_options.isolate_cpus
-            else range(cpu_count())
+            else range(cpu_total)
         )
         disabled_pairs = set()
         previous_settings = {}
@@ -152,13 +151,8 @@ def restore_system_state() -> None:
         logger.debug("Removed CPU shield.")
     if system_state.get("governor-performance"):
         logger.debug("Restoring CPU governors...")
-        for cpu in range(cpu_count()):
-            key = f"governor{cpu}"
-            if key in system_state:
-                set_contents(
-                    f"/sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_governor",
-                    system_state[key],
-                )
+        for governor_file, governor in system_state["governor-performance"].items():
+            set_contents(governor_file, governor)
         logger.debug("Restored CPU governors.")
     logger.debug("Restoring ASLR...")
     if system_state.get("disable-aslr"):
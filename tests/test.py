@@ -1,7 +1,19 @@
 import unittest
 import pandas as pd
-from benchalot.interpolate import interpolate_variables, create_variable_combinations
+from benchalot.interpolate import (
+    interpolate_variables,
+    create_variable_combinations,
+    compile_template,
+    render_template,
+    get_variable_names,
+)
 from benchalot.output import get_combination_filtered_dfs
+from benchalot.config import validate_config
+from benchalot.prepare import (
+    exclude_combination,
+    index_exclusions,
+    create_pruned_combinations,
+)
 
 
 class TestInterpoleVariables(unittest.TestCase):
@@ -34,6 +46,24 @@ class TestInterpoleVariables(unittest.TestCase):
         interpolated_command = interpolate_variables(command, matrix)
         self.assertEqual("echo value1 value2", interpolated_command)
 
+    def test_no_vars(self):
+        command = "echo {name} }}"
+        interpolated_command = interpolate_variables(command, {})
+        self.assertIs(command, interpolated_command)
+
+    def test_compiled_template(self):
+        template = compile_template("echo {{name}} {{name}}-{{other}}")
+        self.assertEqual(
+            "echo a a-1", render_template(template, {"name": "a", "other": 1})
+        )
+        self.assertEqual(
+            "echo b b-2", render_template(template, {"name": "b", "other": 2})
+        )
+
+    def test_variable_names(self):
+        names = get_variable_names("{{b}} {{a.x}} {{b}} {a}")
+        self.assertEqual(["b", "a.x"], names)
+
     def test_existence_simple(self):
         with self.assertRaises(SystemExit) as cm:
             interpolate_variables("command {{test}}", {})
@@ -80,6 +110,60 @@ class TestCreateVariableCombinations(unittest.TestCase):
         self.assertEqual(target_comb, list(comb))
 
 
+class TestExcludeCombination(unittest.TestCase):
+    def test_exclude_simple(self):
+        exclusions = index_exclusions([{"a": 1}, {"a": 2, "b": 3}])
+        self.assertTrue(exclude_combination({"a": 1, "b": 3}, exclusions))
+        self.assertTrue(exclude_combination({"a": 2, "b": 3}, exclusions))
+        self.assertFalse(exclude_combination({"a": 2, "b": 1}, exclusions))
+        self.assertFalse(exclude_combination({"b": 3}, exclusions))
+
+    def test_exclude_compound(self):
+        exclusions = index_exclusions([{"v": {"x": 1, "y": 2}, "a": 1}])
+        self.assertTrue(
+            exclude_combination({"a": 1, "v": {"y": 2, "x": 1}}, exclusions)
+        )
+        self.assertFalse(
+            exclude_combination({"a": 1, "v": {"x": 1, "y": 3}}, exclusions)
+        )
+        self.assertFalse(exclude_combination({"a": 1, "v": [1, 2]}, exclusions))
+
+    def test_pruned_combinations(self):
+        matrix = {"a": [1, 2, 3], "b": [{"x": 1}, {"x": 2}], "c": ["p", "q"]}
+        exclude = [{"a": 2}, {"b": {"x": 1}, "c": "q"}, {"d": 1}]
+        exclusions = index_exclusions(exclude)
+        target_comb = [
+            comb
+            for comb in create_variable_combinations(**matrix)
+            if not exclude_combination(comb, exclusions)
+        ]
+        comb = list(create_pruned_combinations(matrix, exclusions))
+        self.assertEqual(len(comb), 6)
+        self.assertEqual(target_comb, comb)
+
+    def test_pruned_combinations_exclude_all(self):
+        exclusions = index_exclusions([{}])
+        self.assertEqual(list(create_pruned_combinations({"a": [1]}, exclusions)), [])
+        self.assertEqual(list(create_pruned_combinations({}, exclusions)), [])
+
+
+class TestValidateConfig(unittest.TestCase):
+    def test_invalid_list_item(self):
+        with self.assertRaises(SystemExit) as cm:
+            validate_config({"benchmark": ["echo"], "setup": ["echo", 1]})
+        self.assertEqual(cm.exception.code, 1)
+
+    def test_input_unchanged(self):
+        config = {"benchmark": ["echo"], "matrix": {"a": [1]}}
+        validate_config(config)
+        self.assertEqual({"benchmark": ["echo"], "matrix": {"a": [1]}}, config)
+
+    def test_empty_config(self):
+        with self.assertRaises(SystemExit) as cm:
+            validate_config(None)
+        self.assertEqual(cm.exception.code, 1)
+
+
 class TestCombinationFilteredDf(unittest.TestCase):
     def test_simple_comb(self):
         data = pd.DataFrame({"a": [1, 2, 3], "b": [3, 2, 1]})